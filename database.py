@@ -1,23 +1,43 @@
+from pymongo import timeout
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
 from pymongo.errors import ConfigurationError
 from os import environ
 from logging import info
+from functools import lru_cache
 
-from _init_ import start_app
 
-#
-start_app()
+@lru_cache(maxsize=None)
+def create_mongo_client() -> MongoClient:
+    # Build the client once and share its connection pool across requests
+    mongo_db_uri = environ.get('MONGO_DB_URI')
+    mongo_db_password = environ.get('MONGO_DB_PASSWORD')
+    uri = mongo_db_uri.replace('<password>', mongo_db_password)
+    return MongoClient(uri, server_api=ServerApi('1'))
 
-MONGO_DB_URI = environ.get('MONGO_DB_URI')
-MONGO_DB_PASSWORD = environ.get('MONGO_DB_PASSWORD')
-URI = MONGO_DB_URI.replace('<password>', MONGO_DB_PASSWORD)
+
+def close_mongo_client():
+    # When a client has been created
+    if create_mongo_client.cache_info().currsize > 0:
+        create_mongo_client().close()
+
+    create_mongo_client.cache_clear()
+
+
+def check_db(probe_timeout: float) -> bool:
+    # Blocking ping used by the readiness probe, bounded so an unreachable cluster fails fast
+    try:
+        with timeout(probe_timeout):
+            create_mongo_client().admin.command('ping')
+        return True
+    except Exception as e:
+        info(e)
+        return False
 
 
 async def get_mongo_client():
     try:
-        # Create a new client and connect to the server
-        client = MongoClient(URI, server_api=ServerApi('1'))
+        client = create_mongo_client()
         return True, client
     except ConfigurationError as e:
         info(e)
@@ -28,23 +48,6 @@ async def variables():
     return environ.get('MONGO_DB_APPNAME')
 
 
-async def ping_db() -> str:
-    client_check, client = await get_mongo_client()
-
-    # When client is live
-    if client_check:
-        # Send a ping to confirm a successful connection
-        try:
-            client.admin.command('ping')
-            info("Pinged your deployment. You successfully connected to Database!")
-            return 'pong!'
-        except Exception as e:
-            info(e)
-            return 'failed'
-
-    return client
-
-
 async def insert_record(database_name: str, collection_name: str, record: dict):
     _, client = await get_mongo_client()
     # Connect to database
@@ -2,13 +2,11 @@ import string
 from uuid import uuid4
 from json import load
 from functools import wraps
+from functools import lru_cache
 from logging import info
 
 KEY_SALT_SPACE = ' ' + string.ascii_letters + string.punctuation + string.digits
 KEY_SPACE = string.ascii_letters + string.digits
-with open('mimetype.json') as mimetype_file:
-    MIMETYPE = load(mimetype_file)
-    mimetype_file.close()
 
 
 def log_function_call(func):
@@ -36,8 +34,16 @@ def prepare_file_name(filename: str) -> tuple[str, str]:
     return filename, file_extension
 
 
+@lru_cache(maxsize=None)
+def get_mimetype_table() -> dict:
+    with open('mimetype.json') as mimetype_file:
+        mimetype = load(mimetype_file)
+
+    return mimetype
+
+
 def get_file_media_type(file_extension: str) -> str:
-    return MIMETYPE.get(file_extension)
+    return get_mimetype_table().get(file_extension)
 
 
 def key_position_match(index: int, space_length: int):
@@ -56,7 +62,8 @@ def generate_salt(salt_space: str):
     return salt_space_length, salt_index, salt_position
 
 
-def generate_cipher(salt_space: str):
+@lru_cache(maxsize=None)
+def generate_cipher(salt_space: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
     salt_space_length, salt_index, salt_position = generate_salt(salt_space)
 
     key = list(KEY_SPACE)
@@ -73,7 +80,8 @@ def generate_cipher(salt_space: str):
         cipher.pop(_char_index)
         cipher.insert(arranger, _char)
 
-    return key, cipher
+    # Cached tables are shared between calls, so hand them out immutable
+    return tuple(key), tuple(cipher)
 
 
 def encrypt(original_text: str, encryption_key: str):
@@ -10,10 +10,13 @@ from models import Bucket
 
 from boto3 import Session
 from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from botocore.exceptions import EndpointConnectionError
 
-from database import ping_db
+from database import check_db
+from database import get_mongo_client
+from database import close_mongo_client
 from database import insert_record
 from database import get_record
 
@@ -24,6 +27,10 @@ from helper import encrypt
 from helper import decrypt
 from helper import file_or_dir
 from helper import get_file_media_type
+from helper import get_mimetype_table
+from helper import generate_cipher
+
+from _init_ import start_app
 
 from os import environ
 from os import makedirs
@@ -32,18 +39,80 @@ from typing import Annotated
 from bson import ObjectId
 from logging import info
 from uuid import uuid4
+from time import perf_counter
+from time import time
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from contextlib import suppress
+import asyncio
+
+APP_START_TIME = perf_counter()
+PROBE_PATHS = ('/healthz', '/readyz')
+
+# Cached dependency status served by the readiness probe
+APP_STATUS: dict = {'ready': False, 'checks': dict(), 'checked_at': None, 'cold_start_seconds': None}
+
+
+@lru_cache(maxsize=None)
+def get_aws_session() -> Session:
+    return Session(
+        aws_access_key_id=environ.get('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=environ.get('AWS_SECRET_ACCESS_KEY')
+    )
+
+
+@lru_cache(maxsize=None)
+def get_s3_regions() -> frozenset[str]:
+    return frozenset(get_aws_session().get_available_regions('s3'))
+
+
+@lru_cache(maxsize=32)
+def create_s3_client(region: str) -> BaseClient:
+    # Clients are expensive to build and safe to share, so keep one per known region
+    return get_aws_session().client('s3', region_name=region)
+
+
+@lru_cache(maxsize=None)
+def create_s3_probe_client(region: str, probe_timeout: float) -> BaseClient:
+    # Readiness probe client that makes a single attempt and gives up quickly
+    probe_config = Config(
+        connect_timeout=probe_timeout, read_timeout=probe_timeout, retries={'total_max_attempts': 1}
+    )
+    return get_aws_session().client('s3', region_name=region, config=probe_config)
+
+
+def get_preload_regions() -> list[str]:
+    regions = environ.get('AWS_PRELOAD_REGIONS') or str()
+    preload_regions = [region.strip() for region in regions.split(',') if region.strip()]
+
+    # When no region is configured fall back to the session default
+    if not preload_regions:
+        default_region = environ.get('AWS_DEFAULT_REGION') or get_aws_session().region_name
+        if default_region:
+            preload_regions.append(default_region)
 
-aws_session = Session(
-    aws_access_key_id=environ.get('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=environ.get('AWS_SECRET_ACCESS_KEY')
-)
+    # When a region would never be served from the client cache
+    skipped_regions = [region for region in preload_regions if region not in get_s3_regions()]
+    if skipped_regions:
+        info('Skipping unknown S3 regions {}'.format(skipped_regions))
 
-ENCRYPTION_KEY = environ.get('FILE_ENCRYPTION_KEY')
-COLLECTION_NAME = environ.get('MONGO_DB_APP_COLLECTION')
+    return [region for region in preload_regions if region in get_s3_regions()]
+
+
+def get_readiness_interval() -> float:
+    return float(environ.get('READINESS_INTERVAL') or 30)
+
+
+def get_probe_timeout() -> float:
+    return float(environ.get('READINESS_TIMEOUT') or 5)
 
 
 async def aws_s3_session(region: str) -> BaseClient:
-    return aws_session.client('s3', region_name=region)
+    # When region is unknown build a throwaway client so arbitrary names are never cached
+    if region not in get_s3_regions():
+        return get_aws_session().client('s3', region_name=region)
+
+    return create_s3_client(region)
 
 
 async def get_response_status(response: dict):
@@ -161,8 +230,8 @@ async def upload_to_bucket(bucket_name: str, file_path, file_name: str, app_name
     new_file_record_id: str = str()
     if response_status == 200:
         new_file_record = {'file_name': file_name}
-        record_id = await insert_record(app_name, COLLECTION_NAME, new_file_record)
-        new_file_record_id = encrypt(record_id, ENCRYPTION_KEY)
+        record_id = await insert_record(app_name, environ.get('MONGO_DB_APP_COLLECTION'), new_file_record)
+        new_file_record_id = encrypt(record_id, environ.get('FILE_ENCRYPTION_KEY'))
         return new_file_record_id, response_status
 
     return new_file_record_id, response_status
@@ -170,9 +239,9 @@ async def upload_to_bucket(bucket_name: str, file_path, file_name: str, app_name
 
 @log_function_call
 async def get_file_name_by_id(file_id: str, app_name: str):
-    decrypted_file_id = decrypt(file_id, ENCRYPTION_KEY)
+    decrypted_file_id = decrypt(file_id, environ.get('FILE_ENCRYPTION_KEY'))
     filter_query = {'_id': ObjectId(decrypted_file_id)}
-    record_data = await get_record(app_name, COLLECTION_NAME, filter_query)
+    record_data = await get_record(app_name, environ.get('MONGO_DB_APP_COLLECTION'), filter_query)
 
     if record_data:
         return record_data.get('file_name')
@@ -199,16 +268,142 @@ async def delete_from_bucket(bucket_name: str, file_name: str, s3_session):
         return response_status, response
 
 
+def check_s3(probe_timeout: float) -> bool | None:
+    # Blocking credentials check against the first preloaded region
+    regions = get_preload_regions()
+
+    # When no region is known S3 cannot be checked
+    if not regions:
+        return None
+
+    try:
+        create_s3_probe_client(regions[0], probe_timeout).list_buckets()
+        return True
+    except Exception as e:
+        info(e)
+        return False
+
+
+async def run_check(check, probe_timeout: float) -> bool | None:
+    # Backstop in case a client ignores its own timeout, allowing for a full connect and read
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(check, probe_timeout), probe_timeout * 3)
+    except asyncio.TimeoutError:
+        info('Check {} timed out'.format(check.__name__))
+        return False
+
+
+def describe_check(check_result: bool | None) -> str:
+    if check_result is None:
+        return 'not checked'
+
+    return 'ok' if check_result else 'failed'
+
+
+async def refresh_app_status():
+    probe_timeout = get_probe_timeout()
+    database_check, s3_check = await asyncio.gather(run_check(check_db, probe_timeout),
+                                                    run_check(check_s3, probe_timeout))
+    APP_STATUS['checks'] = {'database': describe_check(database_check), 's3': describe_check(s3_check)}
+    APP_STATUS['ready'] = database_check is True and s3_check is not False
+    APP_STATUS['checked_at'] = time()
+
+
+async def poll_app_status(interval: float):
+    while True:
+        await refresh_app_status()
+        await asyncio.sleep(interval)
+
+
+def app_status_is_fresh() -> bool:
+    checked_at = APP_STATUS.get('checked_at')
+
+    # When no check has completed yet
+    if checked_at is None:
+        return False
+
+    return time() - checked_at <= get_readiness_interval() * 3
+
+
+class ColdStartMiddleware:
+    """
+    Pure ASGI middleware that records the time to the first successful request, then passes straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # When the metric is recorded or the request is not tracked
+        if APP_STATUS.get('cold_start_seconds') is not None or scope.get('type') != 'http' \
+                or scope.get('path') in PROBE_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_record(message):
+            # When the first successful response starts
+            if message.get('type') == 'http.response.start' and message.get('status') < 400 \
+                    and APP_STATUS.get('cold_start_seconds') is None:
+                cold_start_seconds = round(perf_counter() - APP_START_TIME, 3)
+                APP_STATUS['cold_start_seconds'] = cold_start_seconds
+                info('metric cold_start_seconds={}'.format(cold_start_seconds))
+
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    start_app()
+
+    # Warm up lookup tables and clients before the first request
+    encryption_key = environ.get('FILE_ENCRYPTION_KEY')
+    if encryption_key:
+        generate_cipher(encryption_key)
+    get_mimetype_table()
+    for region in get_preload_regions():
+        create_s3_client(region)
+        create_s3_probe_client(region, get_probe_timeout())
+
+    # Build the shared Mongo client once here so concurrent first requests cannot each create their own
+    await get_mongo_client()
+
+    # Seeds the readiness status without holding up startup
+    poll_task = asyncio.create_task(poll_app_status(get_readiness_interval()))
+
+    yield
+
+    poll_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await poll_task
+    close_mongo_client()
+
+
 #
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ColdStartMiddleware)
 
 
 @app.get("/")
 async def root():
-    await ping_db()
     return {"message": "Welcome to the AWS Storage Gateway Endpoint"}
 
 
+@app.get("/healthz")
+async def liveness():
+    return {'status': 'alive'}
+
+
+@app.get("/readyz")
+async def readiness(resp: Response):
+    # When the last dependency check failed or has gone stale
+    if not APP_STATUS.get('ready') or not app_status_is_fresh():
+        resp.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return APP_STATUS
+
+
 @app.get("/ping/{bucket_name}")
 async def ping_bucket(bucket_name: str, region_name: str, resp: Response):
     s3_session = await aws_s3_session(region_name)
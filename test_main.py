@@ -0,0 +1,87 @@
+from threading import Event
+from pathlib import Path
+from time import sleep
+from time import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+async def stub_get_mongo_client():
+    return True, None
+
+
+def wait_for_first_check(limit: float = 5):
+    deadline = time() + limit
+    while main.APP_STATUS.get('checked_at') is None and time() < deadline:
+        sleep(0.01)
+
+
+@pytest.fixture
+def app_env(monkeypatch, tmp_path):
+    monkeypatch.chdir(Path(__file__).parent)
+    monkeypatch.setenv('TEMP_DIR', str(tmp_path))
+    monkeypatch.setenv('READINESS_INTERVAL', '30')
+    monkeypatch.setattr(main, 'get_mongo_client', stub_get_mongo_client)
+    monkeypatch.setattr(main, 'get_preload_regions', lambda: list())
+    monkeypatch.setattr(main, 'check_s3', lambda probe_timeout: True)
+    for key, value in {'ready': False, 'checks': dict(), 'checked_at': None, 'cold_start_seconds': None}.items():
+        monkeypatch.setitem(main.APP_STATUS, key, value)
+
+
+def test_healthz_during_startup(app_env, monkeypatch):
+    release = Event()
+
+    def slow_check_db(probe_timeout):
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(main, 'check_db', slow_check_db)
+
+    with TestClient(main.app) as client:
+        try:
+            assert client.get('/healthz').status_code == 200
+            assert client.get('/readyz').status_code == 503
+        finally:
+            release.set()
+
+
+def test_readyz_when_checks_pass(app_env, monkeypatch):
+    monkeypatch.setattr(main, 'check_db', lambda probe_timeout: True)
+
+    with TestClient(main.app) as client:
+        wait_for_first_check()
+        response = client.get('/readyz')
+
+    assert response.status_code == 200
+    assert response.json().get('checks') == {'database': 'ok', 's3': 'ok'}
+
+
+def test_readyz_when_status_is_stale(app_env, monkeypatch):
+    monkeypatch.setattr(main, 'check_db', lambda probe_timeout: True)
+
+    with TestClient(main.app) as client:
+        wait_for_first_check()
+        main.APP_STATUS['checked_at'] = time() - 1000
+        response = client.get('/readyz')
+
+    assert response.status_code == 503
+
+
+def test_cold_start_recorded_on_first_successful_request(app_env, monkeypatch):
+    monkeypatch.setattr(main, 'check_db', lambda probe_timeout: True)
+
+    with TestClient(main.app) as client:
+        client.get('/healthz')
+        client.get('/readyz')
+        client.get('/missing')
+        assert main.APP_STATUS.get('cold_start_seconds') is None
+
+        client.get('/')
+        cold_start_seconds = main.APP_STATUS.get('cold_start_seconds')
+        assert cold_start_seconds is not None
+
+        client.get('/')
+        assert main.APP_STATUS.get('cold_start_seconds') == cold_start_seconds